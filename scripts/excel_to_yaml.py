@@ -4,15 +4,24 @@ Run this script to move card data from Excel to YAML files
 
 import sys
 import traceback
-from typing import Iterator
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import TYPE_CHECKING, Dict, List, Optional
+from xml.etree import ElementTree
 
 import numpy as np
+import openpyxl
 import pandas as pd
-import xlwings as xw
+from openpyxl.utils.cell import range_boundaries
 
 import src.cards as cards
 from src.utils import EXCEL_PATH
 
+if TYPE_CHECKING:
+    # Only used for type hints, since the module is private to openpyxl
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
 
 def main():
     print(f"Exporting card data from '{EXCEL_PATH.name}' to YAML files...")
@@ -22,40 +31,61 @@ def main():
 
 
 def import_from_excel():
-    with xw.App(visible=False) as app:
-        excel_book = app.books.open(str(EXCEL_PATH))
-
-        import_from_traits_sheet(excel_book.sheets["Traits"])
-        import_from_creatures_sheet(excel_book.sheets["Creatures"])
-        import_from_effects_sheet(excel_book.sheets["Effects"])
-
-
-def import_from_traits_sheet(traits_sheet: xw.Sheet):
-    df = import_traits_sheet_to_df(traits_sheet)
-    populate_id_row(df)
+    table_refs = import_table_refs()
+
+    # Read-only mode streams the sheets straight from the .xlsx file, no Excel instance is needed
+    # data_only=True returns the values last calculated by Excel instead of the formulas
+    with closing(openpyxl.load_workbook(EXCEL_PATH, read_only=True, data_only=True)) as excel_book:
+        # The sheets are independent, so they're read in parallel
+        with ThreadPoolExecutor() as executor:
+            df_traits_future = executor.submit(
+                import_traits_sheet_to_df, excel_book["Traits"], table_refs["TableTrait"]
+            )
+            df_creatures_future = executor.submit(
+                import_creatures_sheet_to_df, excel_book["Creatures"], table_refs["TableCreature"]
+            )
+            df_effects_future = executor.submit(
+                import_effects_sheet_to_df, excel_book["Effects"], table_refs["TableEffect"]
+            )
+            df_traits = df_traits_future.result()
+            df_creatures = df_creatures_future.result()
+            df_effects = df_effects_future.result()
+
+    # The cards are created in this thread, in order, since creatures reference traits
+    import_from_traits_df(df_traits)
+    import_from_creatures_df(df_creatures)
+    import_from_effects_df(df_effects)
+
+
+def import_from_traits_df(df: pd.DataFrame):
+    column_lists = get_column_lists(df)
+    columns = zip(
+        column_lists["id"],
+        column_lists["order"],
+        column_lists["name"],
+        column_lists["description"],
+        column_lists["type"],
+        column_lists["value"],
+        column_lists["dev-stage"],
+        column_lists["dev-name"],
+        column_lists["summary"],
+        column_lists["notes"],
+    )
 
-    for _, row in df.iterrows():
+    for trait_id, order, name, description, trait_type, value, dev_stage, dev_name, summary, notes in columns:
         trait_data = cards.TraitData(
-            name=row["name"].strip(),
-            description=row["description"].strip(),
+            name=name,
+            description=description,
         )
         trait_metadata = cards.TraitMetadata(
-            id=row["id"].strip(),
-            type=cards.TraitType(row["type"].strip()),
-            value=(
-                int(row["value"])
-                if not pd.isna(row["value"])
-                else None
-            ),
-            dev_stage=cards.DevStage(row["dev-stage"].strip()),
-            dev_name=row["dev-name"].strip(),
-            order=(
-                int(row["order"])
-                if not pd.isna(row["order"])
-                else None
-            ),
-            summary=row["summary"].strip(),
-            notes=row["notes"].strip(),
+            id=trait_id,
+            type=cards.TraitType(trait_type),
+            value=value,
+            dev_stage=cards.DevStage(dev_stage),
+            dev_name=dev_name,
+            order=order,
+            summary=summary,
+            notes=notes,
         )
         _ = cards.Trait(
             data=trait_data,
@@ -63,7 +93,7 @@ def import_from_traits_sheet(traits_sheet: xw.Sheet):
         )
 
 
-def import_traits_sheet_to_df(traits_sheet: xw.Sheet) -> pd.DataFrame:
+def import_traits_sheet_to_df(traits_sheet: "ReadOnlyWorksheet", table_ref: str) -> pd.DataFrame:
     # Int64 is used here instead of int because it's nullable
     df_types = {
         "id": str,
@@ -78,90 +108,71 @@ def import_traits_sheet_to_df(traits_sheet: xw.Sheet) -> pd.DataFrame:
         "notes": str,
     }
 
-    excel_table_last_cell = traits_sheet.range("TableTrait").last_cell
-    df_raw: pd.DataFrame = traits_sheet.range("A1", excel_table_last_cell).options(pd.DataFrame, index=False).value
-    df_raw_cols_used = df_raw.columns[0:-1]
-    df: pd.DataFrame = df_raw[df_raw_cols_used].copy()
-    df = df.set_axis(
-        list(df_types),
-        axis=1,
-    )
-    for col, col_type in df_types.items():
-        if col_type == str:
-            df[col].fillna("", inplace=True)
-        if col_type == "Int64":
-            df[col].fillna(np.nan, inplace=True)
-    df = df.astype(df_types)
-
-    # At this point, the df has the expected types
-    # But missing values in int columns are going to be written as "<NA>" in the YAML
-    # So we replace them as the empty string
-    df = df.astype(object).fillna("")
+    # The used columns are the first ones, the last column is computed
+    raw_columns_used = import_sheet_columns(traits_sheet, table_ref, max_col=len(df_types))
+    df = build_typed_df(raw_columns_used, df_types)
+
+    populate_id_row(df)
 
     return df
 
 
-def import_from_creatures_sheet(creatures_sheet: xw.Sheet):
-    df = import_creatures_sheet_to_df(creatures_sheet)
+def import_from_creatures_df(df: pd.DataFrame):
+    # Traits are already imported at this point, so they're indexed directly in the dict
+    trait_dict = cards.Trait.get_trait_dict()
+
+    column_lists = get_column_lists(df)
+    columns = zip(
+        column_lists["id"],
+        column_lists["order"],
+        column_lists["name"],
+        column_lists["color"],
+        column_lists["cost-total"],
+        column_lists["cost-color"],
+        column_lists["hp"],
+        column_lists["atk"],
+        column_lists["spe"],
+        column_lists["value"],
+        column_lists["is-token"],
+        column_lists["flavor-text"],
+        column_lists["dev-stage"],
+        column_lists["dev-name"],
+        column_lists["summary"],
+        column_lists["notes"],
+        zip(*[column_lists[f"id-trait-{i}"] for i in range(1, 5)]),
+    )
 
-    for _, row in df.iterrows():
+    for (creature_id, order, name, color, cost_total, cost_color, hp, atk, spe, value, is_token, flavor_text,
+         dev_stage, dev_name, summary, notes, trait_ids) in columns:
         traits = [
-            cards.Trait.get_trait(row[f"id-trait-{i}"].strip())
-            for i in range(1, 5)
-            if not row[f"id-trait-{i}"].strip() == ""
+            trait_dict[trait_id]
+            for trait_id in trait_ids
+            if not trait_id == ""
         ]
         creature_data = cards.CreatureData(
-            name=row["name"],
+            name=name,
             color=(
-                cards.Color(row["color"].strip())
-                if not row["color"].strip() == ""
-                else None
-            ),
-            is_token=row["is-token"],
-            cost_total=(
-                int(row["cost-total"])
-                if not pd.isna(row["cost-total"])
-                else None
-            ),
-            cost_color=(
-                int(row["cost-color"])
-                if not pd.isna(row["cost-color"])
-                else None
-            ),
-            hp=(
-                int(row["hp"])
-                if not pd.isna(row["hp"])
-                else None
-            ),
-            atk=(
-                int(row["atk"])
-                if not pd.isna(row["atk"])
-                else None
-            ),
-            spe=(
-                int(row["spe"])
-                if not pd.isna(row["spe"])
+                cards.Color(color)
+                if not color == ""
                 else None
             ),
+            is_token=is_token,
+            cost_total=cost_total,
+            cost_color=cost_color,
+            hp=hp,
+            atk=atk,
+            spe=spe,
             traits=traits,
-            flavor_text=row["flavor-text"].strip()
+            flavor_text=flavor_text
         )
         creature_metadata = cards.CreatureMetadata(
-            id=row["id"].strip(),
-            value=(
-                int(row["value"])
-                if not pd.isna(row["value"])
-                else None
-            ),
-            dev_stage=cards.DevStage(row["dev-stage"].strip()),
-            dev_name=row["dev-name"].strip(),
-            order=(
-                int(row["order"])
-                if not pd.isna(row["order"])
-                else None
-            ),
-            summary=row["summary"].strip(),
-            notes=row["notes"].strip(),
+            id=creature_id,
+            value=value,
+            dev_stage=cards.DevStage(dev_stage),
+            dev_name=dev_name,
+            order=order,
+            summary=summary,
+            notes=notes,
         )
         _ = cards.Creature(
             data=creature_data,
@@ -169,7 +180,7 @@ def import_from_creatures_sheet(creatures_sheet: xw.Sheet):
         )
 
 
-def import_creatures_sheet_to_df(creatures_sheet: xw.Sheet) -> pd.DataFrame:
+def import_creatures_sheet_to_df(creatures_sheet: "ReadOnlyWorksheet", table_ref: str) -> pd.DataFrame:
     # Int64 is used here instead of int because it's nullable
     df_types = {
         "id": str,
@@ -194,63 +205,56 @@ def import_creatures_sheet_to_df(creatures_sheet: xw.Sheet) -> pd.DataFrame:
         "id-trait-4": str,
     }
 
-    excel_table_last_cell = creatures_sheet.range("TableCreature").last_cell
-    df_raw: pd.DataFrame = creatures_sheet.range("A1", excel_table_last_cell).options(pd.DataFrame, index=False).value
-    df_raw_cols_used = \
-        df_raw.columns[0:9].append(df_raw.columns[13:24])
-    df: pd.DataFrame = df_raw[df_raw_cols_used].copy()
-    df = df.set_axis(
-        list(df_types),
-        axis=1,
-    )
-    for col, col_type in df_types.items():
-        if col_type == str:
-            df[col].fillna("", inplace=True)
-        if col_type == "Int64":
-            df[col].fillna(np.nan, inplace=True)
-    df = df.astype(df_types)
+    # Columns after X are computed, so they aren't read at all
+    raw_columns = import_sheet_columns(creatures_sheet, table_ref, max_col=24)
+    raw_columns_used = raw_columns[0:9] + raw_columns[13:24]
+    df = build_typed_df(raw_columns_used, df_types)
 
     populate_id_row(df)
 
     return df
 
 
-def import_from_effects_sheet(effects_sheet: xw.Sheet):
-    df = import_effects_sheet_to_df(effects_sheet)
+def import_from_effects_df(df: pd.DataFrame):
+    column_lists = get_column_lists(df)
+    columns = zip(
+        column_lists["id"],
+        column_lists["order"],
+        column_lists["name"],
+        column_lists["color"],
+        column_lists["type"],
+        column_lists["cost-total"],
+        column_lists["cost-color"],
+        column_lists["description"],
+        column_lists["flavor-text"],
+        column_lists["dev-stage"],
+        column_lists["dev-name"],
+        column_lists["summary"],
+        column_lists["notes"],
+    )
 
-    for _, row in df.iterrows():
+    for (effect_id, order, name, color, effect_type, cost_total, cost_color, description, flavor_text, dev_stage,
+         dev_name, summary, notes) in columns:
         effect_data = cards.EffectData(
-            name=row["name"].strip(),
+            name=name,
             color=(
-                cards.Color(row["color"].strip())
-                if not row["color"].strip() == ""
-                else None
-            ),
-            type=cards.EffectType(row["type"].strip()),
-            cost_total=(
-                int(row["cost-total"])
-                if not pd.isna(row["cost-total"])
-                else None
-            ),
-            cost_color=(
-                int(row["cost-color"])
-                if not pd.isna(row["cost-color"])
+                cards.Color(color)
+                if not color == ""
                 else None
             ),
-            description=row["description"].strip(),
-            flavor_text=row["flavor-text"].strip()
+            type=cards.EffectType(effect_type),
+            cost_total=cost_total,
+            cost_color=cost_color,
+            description=description,
+            flavor_text=flavor_text
         )
         effect_metadata = cards.EffectMetadata(
-            id=row["id"].strip(),
-            dev_stage=cards.DevStage(row["dev-stage"].strip()),
-            dev_name=row["dev-name"].strip(),
-            order=(
-                int(row["order"])
-                if not pd.isna(row["order"])
-                else None
-            ),
-            summary=row["summary"].strip(),
-            notes=row["notes"].strip(),
+            id=effect_id,
+            dev_stage=cards.DevStage(dev_stage),
+            dev_name=dev_name,
+            order=order,
+            summary=summary,
+            notes=notes,
         )
         _ = cards.Effect(
             data=effect_data,
@@ -258,7 +262,7 @@ def import_from_effects_sheet(effects_sheet: xw.Sheet):
         )
 
 
-def import_effects_sheet_to_df(effects_sheet: xw.Sheet) -> pd.DataFrame:
+def import_effects_sheet_to_df(effects_sheet: "ReadOnlyWorksheet", table_ref: str) -> pd.DataFrame:
     # Int64 is used here instead of int because it's nullable
     df_types = {
         "id": str,
@@ -276,49 +280,124 @@ def import_effects_sheet_to_df(effects_sheet: xw.Sheet) -> pd.DataFrame:
         "notes": str,
     }
 
-    excel_table_last_cell = effects_sheet.range("TableEffect").last_cell
-    df_raw: pd.DataFrame = effects_sheet.range("A1", excel_table_last_cell).options(pd.DataFrame, index=False).value
-    df_raw_cols_used = df_raw.columns[0:-1]
-    df: pd.DataFrame = df_raw[df_raw_cols_used].copy()
-    df = df.set_axis(
-        list(df_types),
-        axis=1,
-    )
-    for col, col_type in df_types.items():
-        if col_type == str:
-            df[col].fillna("", inplace=True)
-        if col_type == "Int64":
-            df[col].fillna(np.nan, inplace=True)
-    df = df.astype(df_types)
+    # The used columns are the first ones, the last column is computed
+    raw_columns_used = import_sheet_columns(effects_sheet, table_ref, max_col=len(df_types))
+    df = build_typed_df(raw_columns_used, df_types)
 
     populate_id_row(df)
 
     return df
 
 
-def populate_id_row(df: pd.DataFrame):
-    id_generator = new_id_generator(df["id"])
+def import_table_refs() -> Dict[str, str]:
+    """
+    Returns the cell range (e.g. "A1:K120") of every table in the Excel file, indexed by table name
+    Read-only worksheets don't load their tables, so the table definitions are read from the .xlsx file directly
+    """
 
-    number_missing_ids = len(df.loc[df["id"] == ""])
-    new_ids = [x for x, _ in zip(id_generator, range(number_missing_ids))]
-    df.loc[df["id"] == "", "id"] = new_ids
+    table_refs: Dict[str, str] = {}
+    with zipfile.ZipFile(EXCEL_PATH) as excel_zip:
+        for file_name in excel_zip.namelist():
+            if not (file_name.startswith("xl/tables/") and file_name.endswith(".xml")):
+                continue
+            table = ElementTree.fromstring(excel_zip.read(file_name))
+            table_refs[table.get("displayName")] = table.get("ref")
+    return table_refs
 
 
-def new_id_generator(id_row: pd.Series) -> Iterator[str]:
+def import_sheet_columns(sheet: "ReadOnlyWorksheet", table_ref: str, max_col: int) -> List[list]:
     """
-    Yields IDs that don't clash with the ones in the given ID row
+    Reads the first max_col columns of the table column by column, without the header row
+    Only the table's range is read, so cells outside the table (e.g. notes below it) aren't imported
+    The columns are kept as plain lists, so the ones that aren't used never go through pandas
     """
 
-    first_id = id_row[id_row != ""].iloc[0]
-    id_initial_letter: str = first_id[0]
+    table_min_col, table_min_row, _, table_max_row = range_boundaries(table_ref)
+    rows = list(sheet.iter_rows(
+        min_row=table_min_row,
+        max_row=table_max_row,
+        min_col=table_min_col,
+        max_col=table_min_col + max_col - 1,
+        values_only=True,
+    ))
+
+    return [list(column[1:]) for column in zip(*rows)]
+
+
+def build_typed_df(raw_columns: List[list], df_types: dict) -> pd.DataFrame:
+    """
+    Builds the df from the raw columns, casting each column to its type in df_types
+    The typed df is built in a single pass, instead of filling and casting the whole df several times
+    """
+
+    return pd.DataFrame({
+        col: cast_column(raw_column, col_type)
+        for (col, col_type), raw_column in zip(df_types.items(), raw_columns)
+    })
+
+
+def get_column_lists(df: pd.DataFrame) -> Dict[str, list]:
+    """
+    Converts each column of the df to a list, with missing values in Int64 columns as None
+    Each column is converted to a list once, which is much faster than accessing the df row by row
+    """
 
-    for i in range(1, 1000):
-        new_id = f"{id_initial_letter}{i:03d}"
-        new_id_exists = id_row.isin([new_id]).any()
-        if not new_id_exists:
-            yield new_id
+    return {
+        col: (
+            to_optional_int_list(df[col])
+            if isinstance(df[col].dtype, pd.Int64Dtype)
+            else df[col].tolist()
+        )
+        for col in df.columns
+    }
+
+
+def cast_column(values: list, col_type) -> pd.Series:
+    """
+    Casts the column values to a Series of the given type
+    Missing values in str columns are set as the empty string, and the others are stripped
+    """
+
+    column = pd.Series(values, dtype=object)
+    if col_type == str:
+        return column.fillna("").astype(str).str.strip()
+    return column.astype(col_type)
+
+
+def to_optional_int_list(column: pd.Series) -> List[Optional[int]]:
+    """
+    Converts the column to a list of ints, with missing values as None
+    """
+
+    return [
+        int(value)
+        if not pd.isna(value)
+        else None
+        for value in column.tolist()
+    ]
+
+
+def populate_id_row(df: pd.DataFrame):
+    # The IDs are filled in the underlying array, which avoids pandas' masked assignment
+    ids = df["id"].to_numpy(copy=True)
+    missing_id_positions = np.flatnonzero(ids == "")
+    if len(missing_id_positions) == 0:
+        return
+
+    id_initial_letter: str = ids[ids != ""][0][0]
+
+    # New IDs are the lowest numbers that aren't used yet, found with a single pass over a set of the used numbers
+    existing_numbers = {
+        int(x[1:])
+        for x in ids
+        if x.startswith(id_initial_letter) and x[1:].isdigit()
+    }
+    free_numbers = [i for i in range(1, 1000) if i not in existing_numbers]
+    if len(free_numbers) < len(missing_id_positions):
+        raise ValueError("All IDs are used")
 
-    raise ValueError("All IDs are used")
+    ids[missing_id_positions] = [f"{id_initial_letter}{i:03d}" for i in free_numbers[:len(missing_id_positions)]]
+    df["id"] = ids
 
 
 if __name__ == "__main__":
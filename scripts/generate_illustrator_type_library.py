@@ -2,19 +2,69 @@
 Run this script to generate the type library for Adobe Illustrator
 
 Requires some work beforehand, check README for more details
+The type library is only generated again if Illustrator was updated since the last time, use --force to always
+generate it
 """
 
+import os
+import re
 import sys
 
+import pythoncom
+import pywintypes
 from win32com.client import makepy
 
 from src.utils import BASE_DIR
 
+TYPE_LIBRARY_PATH = BASE_DIR / "src" / "print_cards" / "illustrator_com.py"
+
+
+def is_type_library_up_to_date() -> bool:
+    """
+    Returns True if the generated type library is newer than the one registered by Illustrator
+    """
+
+    if not TYPE_LIBRARY_PATH.is_file():
+        return False
+
+    # The header of the generated file has the ID and version of the type library it was generated from
+    # It's only ASCII, so it can be read without the file's encoding
+    with open(TYPE_LIBRARY_PATH, "r", encoding="ascii", errors="ignore") as f:
+        header = f.read(4096)
+    clsid_match = re.search(r"^CLSID = IID\('(\{[0-9A-F-]+\})'\)$", header, re.MULTILINE)
+    major_match = re.search(r"^MajorVersion = (\d+)$", header, re.MULTILINE)
+    minor_match = re.search(r"^MinorVersion = (\d+)$", header, re.MULTILINE)
+    lcid_match = re.search(r"^LCID = (0x[0-9a-fA-F]+|\d+)$", header, re.MULTILINE)
+    if clsid_match is None or major_match is None or minor_match is None or lcid_match is None:
+        return False
+
+    try:
+        registered_path = pythoncom.QueryPathOfRegTypeLib(
+            pywintypes.IID(clsid_match.group(1)),
+            int(major_match.group(1)),
+            int(minor_match.group(1)),
+            int(lcid_match.group(1), 0),
+        )
+    except pythoncom.com_error:
+        # The type library version isn't registered anymore, so Illustrator was updated
+        return False
+
+    registered_path = registered_path.rstrip("\0")
+    if not os.path.isfile(registered_path):
+        return False
+
+    return os.path.getmtime(TYPE_LIBRARY_PATH) > os.path.getmtime(registered_path)
+
+
+if "--force" not in sys.argv[1:] and is_type_library_up_to_date():
+    print(f"'{TYPE_LIBRARY_PATH.name}' is up to date, use --force to generate it again")
+    sys.exit(0)
+
 sys.argv = [
     "makepy",
     "-v",
     "-o",
-    str(BASE_DIR / "src" / "print_cards" / "illustrator_com.py"),  # Location where type library will be generated
+    str(TYPE_LIBRARY_PATH),  # Location where type library will be generated
     "Illustrator.Application"  # Can be commented out, a window will pop up to choose the type library
 ]
 
@@ -1,14 +1,27 @@
 """
 Run this script to print all playable cards
+
+Use --draft for a quick preview, cards are exported with a lower resolution to a separate folder
+Already printed cards are skipped, unless their data, art or the card template changed since they were printed
 """
 
+import hashlib
+import json
 import os
+import sys
+from typing import Dict, Set
 
 import src.cards as cards
 import src.print_cards as print_cards
-from src.utils import BASE_DIR
+from src.utils import BASE_DIR, CARD_TEMPLATE_PATH, GIT_TAG_NAME
+
+DRAFT = "--draft" in sys.argv[1:]
+
+# Drafts have their own folder, since already printed cards are skipped
+OUTPUT_DIR = BASE_DIR / ("print_output_draft" if DRAFT else "print_output")
 
-OUTPUT_DIR = BASE_DIR / "print_output"
+# Hashes of what each printed file was printed from, indexed by file name
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
 
 DUPLICATE_CARDS = {
     # No color
@@ -57,6 +70,25 @@ EMPTY_CARDS = {
     cards.Color.CYAN: 1,
 }
 
+
+def get_print_hash(template_mtime: int, *values) -> str:
+    """
+    Returns a hash of the values a printed file depends on
+    The card template and the git tag are always included, since every printed file depends on them
+    """
+
+    content = repr((values, template_mtime, GIT_TAG_NAME))
+    return hashlib.blake2b(content.encode("utf-8")).hexdigest()
+
+
+def is_printed(manifest: Dict[str, str], printed_file_names: Set[str], file_name: str, print_hash: str) -> bool:
+    """
+    Returns True if the file was already printed from the same values
+    """
+
+    return manifest.get(file_name) == print_hash and file_name in printed_file_names
+
+
 cards.import_all_data()
 
 output_dir_fronts = OUTPUT_DIR / "fronts"
@@ -65,48 +97,84 @@ output_dir_backs = OUTPUT_DIR / "backs"
 os.makedirs(output_dir_fronts, exist_ok=True)
 os.makedirs(output_dir_backs, exist_ok=True)
 
+print_manifest: Dict[str, str] = {}
+if MANIFEST_PATH.is_file():
+    print_manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+
+# The output folders are listed once, instead of searching them for every printed file
+printed_fronts = {file.stem for file in output_dir_fronts.iterdir()}
+printed_backs = {file.stem for file in output_dir_backs.iterdir()}
+
+card_template_mtime = CARD_TEMPLATE_PATH.stat().st_mtime_ns
+
 print_index = 1
 
-for color in EMPTY_CARDS:
-    for copy_index in range(1, EMPTY_CARDS[color] + 1):
-        file_name = f"{print_index:03d}_{str(color)}-{copy_index}"
-        if len(list(output_dir_fronts.glob(f"{file_name}*"))) == 0:
-            print_cards.print_blank_card(
-                color,
-                output_dir_fronts,
-                front_file_name=f"{file_name}_front",
-                skip_back=True
-            )
-        if len(list(output_dir_backs.glob(f"{file_name}*"))) == 0:
-            print_cards.print_blank_card(
-                color,
-                output_dir_backs,
-                back_file_name=f"{file_name}_back",
-                skip_front=True
-            )
-        print_index += 1
-
-for main in print_cards.get_all_printable_cards():
-    card_id = main.get_id()
-    if card_id in DUPLICATE_CARDS:
-        card_number_copies = DUPLICATE_CARDS[card_id]
-    else:
-        card_number_copies = 1
-
-    for copy_index in range(1, card_number_copies + 1):
-        file_name = f"{print_index:03d}_{card_id}-{copy_index}"
-        if len(list(output_dir_fronts.glob(f"{file_name}*"))) == 0:
-            print_cards.print_card(
-                main,
-                output_dir_fronts,
-                front_file_name=f"{file_name}_front",
-                skip_back=True
-            )
-        if len(list(output_dir_backs.glob(f"{file_name}*"))) == 0:
-            print_cards.print_card(
-                main,
-                output_dir_backs,
-                back_file_name=f"{file_name}_back",
-                skip_front=True
-            )
-        print_index += 1
+# The manifest is saved even if printing is interrupted, so the files printed until then aren't printed again
+try:
+    for color in EMPTY_CARDS:
+        front_hash = get_print_hash(card_template_mtime, "blank", color)
+        back_hash = get_print_hash(card_template_mtime, "back", color)
+
+        for copy_index in range(1, EMPTY_CARDS[color] + 1):
+            file_name = f"{print_index:03d}_{str(color)}-{copy_index}"
+            if not is_printed(print_manifest, printed_fronts, f"{file_name}_front", front_hash):
+                print_cards.print_blank_card(
+                    color,
+                    output_dir_fronts,
+                    front_file_name=f"{file_name}_front",
+                    skip_back=True,
+                    draft=DRAFT
+                )
+                print_manifest[f"{file_name}_front"] = front_hash
+            if not is_printed(print_manifest, printed_backs, f"{file_name}_back", back_hash):
+                print_cards.print_blank_card(
+                    color,
+                    output_dir_backs,
+                    back_file_name=f"{file_name}_back",
+                    skip_front=True,
+                    draft=DRAFT
+                )
+                print_manifest[f"{file_name}_back"] = back_hash
+            print_index += 1
+
+    all_printable_cards = print_cards.get_all_printable_cards()
+
+    for card_printing_number, main in enumerate(all_printable_cards, start=1):
+        card_id = main.get_id()
+        card_number_copies = DUPLICATE_CARDS.get(card_id, 1)
+
+        # The front also shows the card number, the card art, and the names and descriptions of referenced mechanics
+        front_hash = get_print_hash(
+            card_template_mtime,
+            "front",
+            main.data,
+            print_cards.get_front_texts(main),
+            card_printing_number,
+            len(all_printable_cards),
+            sorted((file.name, file.stat().st_mtime_ns) for file in print_cards.get_card_art_files(main)),
+        )
+        back_hash = get_print_hash(card_template_mtime, "back", main.get_color())
+
+        for copy_index in range(1, card_number_copies + 1):
+            file_name = f"{print_index:03d}_{card_id}-{copy_index}"
+            if not is_printed(print_manifest, printed_fronts, f"{file_name}_front", front_hash):
+                print_cards.print_card(
+                    main,
+                    output_dir_fronts,
+                    front_file_name=f"{file_name}_front",
+                    skip_back=True,
+                    draft=DRAFT
+                )
+                print_manifest[f"{file_name}_front"] = front_hash
+            if not is_printed(print_manifest, printed_backs, f"{file_name}_back", back_hash):
+                print_cards.print_card(
+                    main,
+                    output_dir_backs,
+                    back_file_name=f"{file_name}_back",
+                    skip_front=True,
+                    draft=DRAFT
+                )
+                print_manifest[f"{file_name}_back"] = back_hash
+            print_index += 1
+finally:
+    MANIFEST_PATH.write_text(json.dumps(print_manifest, indent=2, sort_keys=True), encoding="utf-8")
@@ -6,13 +6,14 @@ import os
 import shutil
 import sys
 import traceback
+from contextlib import contextmanager
+from typing import List
 
 import pandas as pd
 import xlwings as xw
-import yaml
 
 import src.cards as cards
-from src.utils import EXCEL_PATH, EXCEL_BACKUP_PATH, EXCEL_TEMPLATE_PATH, VALUES_DATA_PATH
+from src.utils import EXCEL_PATH, EXCEL_BACKUP_PATH, EXCEL_TEMPLATE_PATH, VALUES_DATA_PATH, load_yaml_file
 
 
 def main():
@@ -35,38 +36,54 @@ def export_to_excel():
     with xw.App(visible=False) as app:
         excel_book = app.books.open(str(EXCEL_PATH))
 
-        export_to_traits_sheet(excel_book.sheets["Traits"])
-        export_to_creatures_sheet(excel_book.sheets["Creatures"])
-        export_to_effects_sheet(excel_book.sheets["Effects"])
-        export_to_creature_values_sheet(excel_book.sheets["Creatures - Value"])
+        # All cards are sorted once, then shared by the creatures and effects sheets
+        all_cards = cards.get_all_cards()
+
+        with excel_fast_mode(app):
+            export_to_traits_sheet(excel_book.sheets["Traits"])
+            export_to_creatures_sheet(excel_book.sheets["Creatures"], all_cards)
+            export_to_effects_sheet(excel_book.sheets["Effects"], all_cards)
+            export_to_creature_values_sheet(excel_book.sheets["Creatures - Value"])
 
         excel_book.save()
 
 
+@contextmanager
+def excel_fast_mode(app: xw.App):
+    """
+    Disables screen updating, automatic calculation and events while inside the context
+    Otherwise, Excel repaints and recalculates the workbook after every write
+    The previous settings are restored on exit, which also recalculates the workbook
+    """
+
+    screen_updating = app.screen_updating
+    calculation = app.calculation
+    enable_events = app.enable_events
+
+    app.screen_updating = False
+    app.calculation = "manual"
+    app.enable_events = False
+    try:
+        yield
+    finally:
+        app.screen_updating = screen_updating
+        app.calculation = calculation
+        app.enable_events = enable_events
+
+
 def export_to_traits_sheet(traits_sheet: xw.Sheet):
     df = get_traits_df()
 
-    # Copy formatting from template row
-    for _ in range(len(df)):
-        traits_sheet.range("3:3").insert(
-            shift="down",
-            copy_origin="format_from_left_or_above"
-        )
-
-    traits_sheet["A3"].options(index=False, header=False).value = df["id"]
-    traits_sheet["B3"].options(index=False, header=False).value = df["order"]
-    traits_sheet["C3"].options(index=False, header=False).value = df["name"]
-    traits_sheet["D3"].options(index=False, header=False).value = df["description"]
-    traits_sheet["E3"].options(index=False, header=False).value = df["type"]
-    traits_sheet["F3"].options(index=False, header=False).value = df["value"]
-    traits_sheet["G3"].options(index=False, header=False).value = df["dev-stage"]
-    traits_sheet["H3"].options(index=False, header=False).value = df["dev-name"]
-    traits_sheet["I3"].options(index=False, header=False).value = df["summary"]
-    traits_sheet["J3"].options(index=False, header=False).value = df["notes"]
+    insert_rows_below_template_row(traits_sheet, len(df))
+
+    # Data columns are contiguous, so they're written in a single call instead of one call per column
+    traits_sheet["A3"].options(index=False, header=False).value = df
 
     # Delete template row
     traits_sheet.range("2:2").delete(shift="up")
 
+    # The sort key is a formula column, so it's calculated first in case automatic calculation is off
+    traits_sheet.book.app.calculate()
     traits_sheet["A1"].expand("table").api.Sort(
         Key1=traits_sheet.range("K:K").api,
         Order1=2,
@@ -111,44 +128,45 @@ def get_traits_df() -> pd.DataFrame:
     return df
 
 
-def export_to_creatures_sheet(creatures_sheet: xw.Sheet):
-    df = get_creatures_df()
-
-    # Copy formatting from template row
-    for _ in range(len(df)):
-        creatures_sheet.range("3:3").insert(
-            shift="down",
-            copy_origin="format_from_left_or_above"
-        )
-
-    creatures_sheet["A3"].options(index=False, header=False).value = df["id"]
-    creatures_sheet["B3"].options(index=False, header=False).value = df["order"]
-    creatures_sheet["C3"].options(index=False, header=False).value = df["name"]
-    creatures_sheet["D3"].options(index=False, header=False).value = df["color"]
-    creatures_sheet["E3"].options(index=False, header=False).value = df["cost-total"]
-    creatures_sheet["F3"].options(index=False, header=False).value = df["cost-color"]
-    creatures_sheet["G3"].options(index=False, header=False).value = df["hp"]
-    creatures_sheet["H3"].options(index=False, header=False).value = df["atk"]
-    creatures_sheet["I3"].options(index=False, header=False).value = df["spe"]
-    creatures_sheet["O3"].options(index=False, header=False).value = df["is-token"]
-    creatures_sheet["P3"].options(index=False, header=False).value = df["flavor-text"]
-    creatures_sheet["Q3"].options(index=False, header=False).value = df["dev-stage"]
-    creatures_sheet["R3"].options(index=False, header=False).value = df["dev-name"]
-    creatures_sheet["S3"].options(index=False, header=False).value = df["summary"]
-    creatures_sheet["T3"].options(index=False, header=False).value = df["notes"]
-    creatures_sheet["U3"].options(index=False, header=False).value = df["id-trait-1"]
-    creatures_sheet["V3"].options(index=False, header=False).value = df["id-trait-2"]
-    creatures_sheet["W3"].options(index=False, header=False).value = df["id-trait-3"]
-    creatures_sheet["X3"].options(index=False, header=False).value = df["id-trait-4"]
+def export_to_creatures_sheet(creatures_sheet: xw.Sheet, all_cards: List[cards.Card]):
+    df = get_creatures_df(all_cards)
+
+    insert_rows_below_template_row(creatures_sheet, len(df))
+
+    # Data columns are written in one call per contiguous block instead of one call per column
+    # Columns J to N are skipped, since they have formulas
+    creatures_sheet["A3"].options(index=False, header=False).value = df[[
+        "id",
+        "order",
+        "name",
+        "color",
+        "cost-total",
+        "cost-color",
+        "hp",
+        "atk",
+        "spe",
+    ]]
+    creatures_sheet["O3"].options(index=False, header=False).value = df[[
+        "is-token",
+        "flavor-text",
+        "dev-stage",
+        "dev-name",
+        "summary",
+        "notes",
+        "id-trait-1",
+        "id-trait-2",
+        "id-trait-3",
+        "id-trait-4",
+    ]]
 
     # Delete template row
     creatures_sheet.range("2:2").delete(shift="up")
 
 
-def get_creatures_df() -> pd.DataFrame:
+def get_creatures_df(all_cards: List[cards.Card]) -> pd.DataFrame:
     df_data = []
 
-    creature_list = [c for c in cards.get_all_cards() if isinstance(c, cards.Creature)]
+    creature_list = [c for c in all_cards if isinstance(c, cards.Creature)]
     for creature in creature_list:
         df_row = {
             "id": creature.metadata.id,
@@ -198,38 +216,22 @@ def get_creatures_df() -> pd.DataFrame:
     return df
 
 
-def export_to_effects_sheet(effects_sheet: xw.Sheet):
-    df = get_effects_df()
-
-    # Copy formatting from template row
-    for _ in range(len(df)):
-        effects_sheet.range("3:3").insert(
-            shift="down",
-            copy_origin="format_from_left_or_above"
-        )
-
-    effects_sheet["A3"].options(index=False, header=False).value = df["id"]
-    effects_sheet["B3"].options(index=False, header=False).value = df["order"]
-    effects_sheet["C3"].options(index=False, header=False).value = df["name"]
-    effects_sheet["D3"].options(index=False, header=False).value = df["color"]
-    effects_sheet["E3"].options(index=False, header=False).value = df["type"]
-    effects_sheet["F3"].options(index=False, header=False).value = df["cost-total"]
-    effects_sheet["G3"].options(index=False, header=False).value = df["cost-color"]
-    effects_sheet["H3"].options(index=False, header=False).value = df["description"]
-    effects_sheet["I3"].options(index=False, header=False).value = df["flavor-text"]
-    effects_sheet["J3"].options(index=False, header=False).value = df["dev-stage"]
-    effects_sheet["K3"].options(index=False, header=False).value = df["dev-name"]
-    effects_sheet["L3"].options(index=False, header=False).value = df["summary"]
-    effects_sheet["M3"].options(index=False, header=False).value = df["notes"]
+def export_to_effects_sheet(effects_sheet: xw.Sheet, all_cards: List[cards.Card]):
+    df = get_effects_df(all_cards)
+
+    insert_rows_below_template_row(effects_sheet, len(df))
+
+    # Data columns are contiguous, so they're written in a single call instead of one call per column
+    effects_sheet["A3"].options(index=False, header=False).value = df
 
     # Delete template row
     effects_sheet.range("2:2").delete(shift="up")
 
 
-def get_effects_df() -> pd.DataFrame:
+def get_effects_df(all_cards: List[cards.Card]) -> pd.DataFrame:
     df_data = []
 
-    effect_list = [c for c in cards.get_all_cards() if isinstance(c, cards.Effect)]
+    effect_list = [c for c in all_cards if isinstance(c, cards.Effect)]
     for effect in effect_list:
         df_row = {
             "id": effect.metadata.id,
@@ -268,31 +270,49 @@ def get_effects_df() -> pd.DataFrame:
     return df
 
 
+def insert_rows_below_template_row(sheet: xw.Sheet, number_rows: int):
+    """
+    Inserts rows below the template row (row 2), copying its formatting
+    All rows are inserted in a single call, instead of one call per row
+    """
+
+    if number_rows == 0:
+        return
+
+    sheet.range(f"3:{2 + number_rows}").insert(
+        shift="down",
+        copy_origin="format_from_left_or_above"
+    )
+
+
 def export_to_creature_values_sheet(creature_values_sheet: xw.Sheet):
-    with open(VALUES_DATA_PATH, "r") as f:
-        values_data = yaml.safe_load(f)["values"]
-
-    for row_index, (cost_total, value) in enumerate(values_data["cost-total"].items(), start=2):
-        creature_values_sheet[f"A{row_index}"].value = cost_total
-        creature_values_sheet[f"B{row_index}"].value = value
-
-    for row_index, (color, value_data) in enumerate(values_data["color"].items(), start=2):
-        creature_values_sheet[f"D{row_index}"].value = color
-        creature_values_sheet[f"E{row_index}"].value = value_data["cost-total-low"]
-        creature_values_sheet[f"F{row_index}"].value = value_data["cost-total-mid"]
-        creature_values_sheet[f"G{row_index}"].value = value_data["cost-total-high"]
-
-    for row_index, (hp, value) in enumerate(values_data["hp"].items(), start=2):
-        creature_values_sheet[f"I{row_index}"].value = hp
-        creature_values_sheet[f"J{row_index}"].value = value
-
-    for row_index, (atk, value) in enumerate(values_data["atk"].items(), start=2):
-        creature_values_sheet[f"L{row_index}"].value = atk
-        creature_values_sheet[f"M{row_index}"].value = value
-
-    for row_index, (spd, value) in enumerate(values_data["spd"].items(), start=2):
-        creature_values_sheet[f"O{row_index}"].value = spd
-        creature_values_sheet[f"P{row_index}"].value = value
+    values_data = load_yaml_file(VALUES_DATA_PATH)["values"]
+
+    # Each table is written as a 2D list in a single call, instead of cell by cell
+    creature_values_sheet["A2"].value = [
+        [cost_total, value]
+        for cost_total, value in values_data["cost-total"].items()
+    ]
+
+    creature_values_sheet["D2"].value = [
+        [color, value_data["cost-total-low"], value_data["cost-total-mid"], value_data["cost-total-high"]]
+        for color, value_data in values_data["color"].items()
+    ]
+
+    creature_values_sheet["I2"].value = [
+        [hp, value]
+        for hp, value in values_data["hp"].items()
+    ]
+
+    creature_values_sheet["L2"].value = [
+        [atk, value]
+        for atk, value in values_data["atk"].items()
+    ]
+
+    creature_values_sheet["O2"].value = [
+        [spd, value]
+        for spd, value in values_data["spd"].items()
+    ]
 
 
 if __name__ == "__main__":
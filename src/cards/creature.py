@@ -1,12 +1,10 @@
 from dataclasses import dataclass, field
-from typing import Optional, Self, ClassVar, Dict, List
-
-import yaml
+from typing import Optional, Self, ClassVar, Dict, List, Any
 
 from src.cards.abstract_classes import Card
 from src.cards.enums import Color, DevStage, _MechanicIdPrefix
 from src.cards.trait import Trait
-from src.utils import CREATURE_DATA_PATH
+from src.utils import CREATURE_DATA_PATH, load_yaml_file, load_yaml_files, write_yaml_files
 
 
 @dataclass(frozen=True)
@@ -34,6 +32,22 @@ class CreatureMetadata:
     notes: str = ""
 
 
+# YAML string of each trait inside the creature files, indexed by trait ID
+# Traits are shared by many creatures, so each string is formatted only once
+_trait_yaml_strs: Dict[str, str] = {}
+
+
+def _get_trait_yaml_str(trait: Trait) -> str:
+    trait_id = trait.metadata.id
+    if trait_id not in _trait_yaml_strs:
+        _trait_yaml_strs[trait_id] = f"""
+      - name: {trait.data.name}
+        description: {trait.data.description}
+        id: {trait_id}
+"""[1:]
+    return _trait_yaml_strs[trait_id]
+
+
 @dataclass(frozen=True)
 class Creature(Card):
     _id_prefix: ClassVar[str] = _MechanicIdPrefix.CREATURE
@@ -93,8 +107,14 @@ class Creature(Card):
         """
 
         yaml_path = CREATURE_DATA_PATH / f"{creature_id}.yaml"
-        with open(yaml_path, "r") as f:
-            yaml_data = yaml.safe_load(f)["creature"]
+        return cls._import_from_yaml_data(load_yaml_file(yaml_path)["creature"])
+
+    @classmethod
+    def _import_from_yaml_data(cls, yaml_data: Dict[str, Any]) -> Self:
+        """
+        Creates the creature from the data parsed from its YAML file.
+        Returns the imported creature.
+        """
 
         traits_list = []
         if "traits" in yaml_data["data"]:
@@ -189,14 +209,9 @@ class Creature(Card):
         notes_str = self.metadata.notes.strip().replace("\n", "\n      ")
         traits_str = ""
         if len(self.data.traits) > 0:
-            traits_str += "traits:\n"
-            for trait in self.data.traits:
-                trait_str = f"""
-      - name: {trait.data.name}
-        description: {trait.data.description}
-        id: {trait.metadata.id}"""[1:]
-                traits_str += trait_str + "\n"
-            traits_str = traits_str + "    "
+            # The trait blocks are joined at once, instead of concatenated one by one
+            trait_strs = [_get_trait_yaml_str(trait) for trait in self.data.traits]
+            traits_str = "".join(["traits:\n", *trait_strs, "    "])
 
         yaml_content = f"""
 creature:
@@ -222,9 +237,9 @@ creature:
     notes: |
       {notes_str}"""[1:]
 
+        # newline="\n" prevents the newlines from being converted to CRLF on Windows
         yaml_path = CREATURE_DATA_PATH / f"{self.metadata.id}.yaml"
-        with open(yaml_path, "w") as f:
-            f.write(yaml_content)
+        yaml_path.write_text(yaml_content, encoding="utf-8", newline="\n")
 
     @classmethod
     def import_all_from_yaml(cls) -> None:
@@ -232,9 +247,8 @@ creature:
         Reads all creatures' data from the YAML files.
         """
 
-        for yaml_path in CREATURE_DATA_PATH.iterdir():
-            creature_id = str(yaml_path.stem)
-            _ = cls.import_from_yaml(creature_id)
+        for yaml_data in load_yaml_files(CREATURE_DATA_PATH.iterdir()):
+            _ = cls._import_from_yaml_data(yaml_data["creature"])
 
     @classmethod
     def export_all_to_yaml(cls) -> None:
@@ -242,5 +256,4 @@ creature:
         Writes all creature's data to YAML files.
         """
 
-        for creature in cls._creature_dict.values():
-            creature.export_to_yaml()
+        write_yaml_files(Creature.export_to_yaml, cls._creature_dict.values())
@@ -1,11 +1,9 @@
 from dataclasses import dataclass
-from typing import Optional, Self, ClassVar, Dict
-
-import yaml
+from typing import Optional, Self, ClassVar, Dict, Any
 
 from src.cards.abstract_classes import Card
 from src.cards.enums import Color, DevStage, EffectType, _MechanicIdPrefix
-from src.utils import EFFECT_DATA_PATH
+from src.utils import EFFECT_DATA_PATH, load_yaml_file, load_yaml_files, write_yaml_files
 
 
 @dataclass(frozen=True)
@@ -88,8 +86,14 @@ class Effect(Card):
         """
 
         yaml_path = EFFECT_DATA_PATH / f"{effect_id}.yaml"
-        with open(yaml_path, "r") as f:
-            yaml_data = yaml.safe_load(f)["effect"]
+        return cls._import_from_yaml_data(load_yaml_file(yaml_path)["effect"])
+
+    @classmethod
+    def _import_from_yaml_data(cls, yaml_data: Dict[str, Any]) -> Self:
+        """
+        Creates the effect from the data parsed from its YAML file.
+        Returns the imported effect.
+        """
 
         effect_data = EffectData(
             name=(
@@ -173,9 +177,9 @@ effect:
     notes: |
       {notes_str}"""[1:]
 
+        # newline="\n" prevents the newlines from being converted to CRLF on Windows
         yaml_path = EFFECT_DATA_PATH / f"{self.metadata.id}.yaml"
-        with open(yaml_path, "w") as f:
-            f.write(yaml_content)
+        yaml_path.write_text(yaml_content, encoding="utf-8", newline="\n")
 
     @classmethod
     def import_all_from_yaml(cls) -> None:
@@ -183,9 +187,8 @@ effect:
         Reads all effects' data from the YAML files.
         """
 
-        for yaml_path in EFFECT_DATA_PATH.iterdir():
-            effect_id = str(yaml_path.stem)
-            _ = cls.import_from_yaml(effect_id)
+        for yaml_data in load_yaml_files(EFFECT_DATA_PATH.iterdir()):
+            _ = cls._import_from_yaml_data(yaml_data["effect"])
 
     @classmethod
     def export_all_to_yaml(cls) -> None:
@@ -193,5 +196,4 @@ effect:
         Writes all effects' data to YAML files.
         """
 
-        for effect in cls._effect_dict.values():
-            effect.export_to_yaml()
+        write_yaml_files(Effect.export_to_yaml, cls._effect_dict.values())
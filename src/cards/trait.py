@@ -1,11 +1,9 @@
 from dataclasses import dataclass
-from typing import Optional, Self, ClassVar, Dict
-
-import yaml
+from typing import Optional, Self, ClassVar, Dict, Any
 
 from src.cards.abstract_classes import Mechanic
 from src.cards.enums import DevStage, TraitType, _MechanicIdPrefix
-from src.utils import TRAIT_DATA_PATH
+from src.utils import TRAIT_DATA_PATH, load_yaml_file, load_yaml_files, write_yaml_files
 
 
 @dataclass(frozen=True)
@@ -75,8 +73,14 @@ class Trait(Mechanic):
         """
 
         yaml_path = TRAIT_DATA_PATH / f"{trait_id}.yaml"
-        with open(yaml_path, "r") as f:
-            yaml_data = yaml.safe_load(f)["trait"]
+        return cls._import_from_yaml_data(load_yaml_file(yaml_path)["trait"])
+
+    @classmethod
+    def _import_from_yaml_data(cls, yaml_data: Dict[str, Any]) -> Self:
+        """
+        Creates the trait from the data parsed from its YAML file.
+        Returns the imported trait.
+        """
 
         trait_data = TraitData(
             name=(
@@ -142,9 +146,9 @@ trait:
     notes: |
       {notes_str}"""[1:]
 
+        # newline="\n" prevents the newlines from being converted to CRLF on Windows
         yaml_path = TRAIT_DATA_PATH / f"{self.metadata.id}.yaml"
-        with open(yaml_path, "w") as f:
-            f.write(yaml_content)
+        yaml_path.write_text(yaml_content, encoding="utf-8", newline="\n")
 
     @classmethod
     def import_all_from_yaml(cls) -> None:
@@ -152,9 +156,8 @@ trait:
         Reads all traits' data from the YAML files.
         """
 
-        for yaml_path in TRAIT_DATA_PATH.iterdir():
-            trait_id = str(yaml_path.stem)
-            _ = cls.import_from_yaml(trait_id)
+        for yaml_data in load_yaml_files(TRAIT_DATA_PATH.iterdir()):
+            _ = cls._import_from_yaml_data(yaml_data["trait"])
 
     @classmethod
     def export_all_to_yaml(cls) -> None:
@@ -162,5 +165,4 @@ trait:
         Writes all traits' data to YAML files.
         """
 
-        for trait in cls._trait_dict.values():
-            trait.export_to_yaml()
+        write_yaml_files(Trait.export_to_yaml, cls._trait_dict.values())
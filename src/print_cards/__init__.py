@@ -1,5 +1,14 @@
 from src.print_cards.errors import CardPrintError, IllustratorTemplateError
-from src.print_cards.helpers import get_all_printable_cards
+from src.print_cards.generate_front import get_front_texts
+from src.print_cards.helpers import get_all_printable_cards, get_card_art_files
 from src.print_cards.print import print_card, print_blank_card
 
-__all__ = ["CardPrintError", "IllustratorTemplateError", "get_all_printable_cards", "print_card", "print_blank_card"]
+__all__ = [
+    "CardPrintError",
+    "IllustratorTemplateError",
+    "get_front_texts",
+    "get_all_printable_cards",
+    "get_card_art_files",
+    "print_card",
+    "print_blank_card",
+]
@@ -1,5 +1,6 @@
 from enum import StrEnum
 
+import src.cards as cards
 import src.print_cards.illustrator_com as illustrator_com
 
 # This is needed because EXPORT_OPTIONS_TIFF references instances of COM classes
@@ -34,6 +35,22 @@ ILLUSTRATOR_LAYER_LIST = [
 ]
 
 
+# Page items of the background color layer, mapped to the color they're used for
+# Keys must match the page item names in Illustrator
+BACKGROUND_COLOR_PAGE_ITEMS = {
+    "BackgroundNone": cards.Color.NONE,
+    "BackgroundBlack": cards.Color.BLACK,
+    "BackgroundBlue": cards.Color.BLUE,
+    "BackgroundCyan": cards.Color.CYAN,
+    "BackgroundGreen": cards.Color.GREEN,
+    "BackgroundOrange": cards.Color.ORANGE,
+    "BackgroundPink": cards.Color.PINK,
+    "BackgroundPurple": cards.Color.PURPLE,
+    "BackgroundWhite": cards.Color.WHITE,
+    "BackgroundYellow": cards.Color.YELLOW,
+}
+
+
 # Values must match the style names in Illustrator
 class ILLUSTRATOR_STYLE(StrEnum):
     DESCRIPTION = "Description"
@@ -67,14 +84,20 @@ KEYWORD_TO_CHARACTER_DICT = {
 }
 
 
+# Draft exports are for previewing cards, they're much faster to rasterize and write than the ones for printing
+EXPORT_RESOLUTION = 300
+EXPORT_RESOLUTION_DRAFT = 150
+
+
 # This is a function so that execution is delayed until the Illustrator app is loaded (otherwise initializing export
 # options will throw an error
-def get_export_options() -> illustrator_com.ExportOptionsTIFF:
+def get_export_options(draft: bool = False) -> illustrator_com.ExportOptionsTIFF:
     export_options = illustrator_com.ExportOptionsTIFF()
     export_options.AntiAliasing = illustrator_com.constants.aiArtOptimized
     export_options.ByteOrder = illustrator_com.constants.aiIBMPC
     export_options.ImageColorSpace = illustrator_com.constants.aiImageCMYK
-    export_options.LZWCompression = False
-    export_options.Resolution = 300
+    # Exports for printing are kept uncompressed as they've always been, drafts are compressed to write less data
+    export_options.LZWCompression = draft
+    export_options.Resolution = EXPORT_RESOLUTION_DRAFT if draft else EXPORT_RESOLUTION
     export_options.SaveMultipleArtboards = False
     return export_options
@@ -1,31 +1,79 @@
+from typing import Any, Dict, List, Tuple
+
 import src.cards as cards
 import src.print_cards.errors as errors
 import src.print_cards.helpers as helpers
 import src.print_cards.helpers_replacement as helpers_replacement
 import src.print_cards.illustrator_com as illustrator_com
 from src.print_cards.configs import (ILLUSTRATOR_LAYER, ILLUSTRATOR_STYLE, TOKEN_TRAIT_NAME,
-                                     TOKEN_TRAIT_DESCRIPTION)
-from src.utils import GIT_TAG_NAME, CARD_ARTS_DIR
+                                     TOKEN_TRAIT_DESCRIPTION, BACKGROUND_COLOR_PAGE_ITEMS)
+from src.utils import GIT_TAG_NAME
 
 
 def generate_front(card: cards.Card, document: illustrator_com.Document) -> None:
-    non_creature_layer = helpers.get_layer(document, ILLUSTRATOR_LAYER.NON_CREATURE)
-    _generate_non_creature_layer(card, non_creature_layer)
+    layers = helpers.get_layers(document)
+    styles = helpers.get_styles(document)
+    color = card.get_color()
+
+    non_creature_layer = layers[ILLUSTRATOR_LAYER.NON_CREATURE]
+    _generate_non_creature_layer(card, non_creature_layer, styles)
 
-    creature_layer = helpers.get_layer(document, ILLUSTRATOR_LAYER.CREATURE)
-    _generate_creature_layer(card, creature_layer)
+    creature_layer = layers[ILLUSTRATOR_LAYER.CREATURE]
+    _generate_creature_layer(card, creature_layer, styles)
 
-    base_layer = helpers.get_layer(document, ILLUSTRATOR_LAYER.BASE)
-    _generate_base_layer(card, base_layer)
+    base_layer = layers[ILLUSTRATOR_LAYER.BASE]
+    _generate_base_layer(card, color, base_layer)
 
-    background_color_layer = helpers.get_layer(document, ILLUSTRATOR_LAYER.BACKGROUND_COLOR)
-    _generate_background_color_layer(card, background_color_layer)
+    background_color_layer = layers[ILLUSTRATOR_LAYER.BACKGROUND_COLOR]
+    _generate_background_color_layer(card, color, background_color_layer)
 
-    aux_layer = helpers.get_layer(document, ILLUSTRATOR_LAYER.AUXILIARY)
+    aux_layer = layers[ILLUSTRATOR_LAYER.AUXILIARY]
     aux_layer.Visible = False
 
 
-def _generate_non_creature_layer(card: cards.Card, layer: illustrator_com.Layer) -> None:
+def get_front_texts(card: cards.Card) -> List[str]:
+    """
+    Returns the texts that are shown in the front of the card, with their placeholders replaced.
+
+    Besides the card's own data, these depend on the names and descriptions of the traits and mechanics it references.
+    """
+
+    if isinstance(card, cards.Creature):
+        descriptions = [paragraph for _, paragraph in _get_creature_description_paragraphs(card)]
+    else:
+        descriptions = [card.data.description]
+
+    texts = [card.get_name()]
+    for description in descriptions:
+        text, _, _ = helpers_replacement.replace_placeholders_in_text(description)
+        texts.append(text)
+    return texts
+
+
+def _get_creature_description_paragraphs(card: cards.Creature) -> List[Tuple[str, str]]:
+    """
+    Returns the paragraphs of the creature description, one for each trait, as tuples (trait name, paragraph)
+    """
+
+    traits_name = [t.get_name() for t in card.data.traits]
+    traits_description = [t.data.description for t in card.data.traits]
+
+    # If the creature is a token, we add a "fake trait"
+    if card.data.is_token:
+        traits_name.insert(0, TOKEN_TRAIT_NAME)
+        traits_description.insert(0, TOKEN_TRAIT_DESCRIPTION)
+
+    return [
+        (trait_name, f"{trait_name} {trait_description}")
+        for trait_name, trait_description in zip(traits_name, traits_description)
+    ]
+
+
+def _generate_non_creature_layer(
+        card: cards.Card,
+        layer: illustrator_com.Layer,
+        styles: Dict[ILLUSTRATOR_STYLE, Any],
+) -> None:
     if isinstance(card, cards.Creature):
         # This layer isn't used by creature cards
         layer.Visible = False
@@ -43,28 +91,44 @@ def _generate_non_creature_layer(card: cards.Card, layer: illustrator_com.Layer)
     page_items["AuraIcon"].Hidden = (not card.data.type == cards.EffectType.AURA)
     page_items["ActionIcon"].Hidden = (not card.data.type == cards.EffectType.ACTION)
     page_items["FieldIcon"].Hidden = (not card.data.type == cards.EffectType.FIELD)
-    _generate_non_creature_layer_description(card, page_items["Description"])
+    _generate_non_creature_layer_description(card, page_items["Description"], styles)
 
 
-def _generate_non_creature_layer_description(card: cards.Effect, description: illustrator_com.TextFrame) -> None:
-    description_style = helpers.get_style(description, ILLUSTRATOR_STYLE.DESCRIPTION)
-    icons_style = helpers.get_style(description, ILLUSTRATOR_STYLE.ICONS)
-    reference_name_style = helpers.get_style(description, ILLUSTRATOR_STYLE.REFERENCE_NAME)
+def _generate_non_creature_layer_description(
+        card: cards.Effect,
+        description: illustrator_com.TextFrame,
+        styles: Dict[ILLUSTRATOR_STYLE, Any],
+) -> None:
+    description_style = styles[ILLUSTRATOR_STYLE.DESCRIPTION]
+    icons_style = styles[ILLUSTRATOR_STYLE.ICONS]
+    reference_name_style = styles[ILLUSTRATOR_STYLE.REFERENCE_NAME]
 
-    helpers.prepare_text_frame(description)
+    helpers.prepare_text_frame(description, styles)
 
     description.Contents = card.data.description
     icons_indexes, reference_names_indexes = helpers_replacement.replace_placeholders(description)
+    icons_indexes = set(icons_indexes)
+    reference_names_indexes = set(reference_names_indexes)
+
+    character_styles = []
     for i in range(1, len(description.Contents) + 1):
         if i in icons_indexes:
-            icons_style.ApplyTo(description.Characters.Item(i), True)
+            character_styles.append(icons_style)
         elif i in reference_names_indexes:
-            reference_name_style.ApplyTo(description.Characters.Item(i), True)
+            character_styles.append(reference_name_style)
         else:
-            description_style.ApplyTo(description.Characters.Item(i), True)
+            character_styles.append(description_style)
+
+    # Styles are applied once for each run of characters with the same style, instead of once for each character
+    for start, length, style in helpers.get_character_style_runs(character_styles):
+        style.ApplyTo(helpers.get_text_range(description, start, length), True)
 
 
-def _generate_creature_layer(card: cards.Card, layer: illustrator_com.Layer) -> None:
+def _generate_creature_layer(
+        card: cards.Card,
+        layer: illustrator_com.Layer,
+        styles: Dict[ILLUSTRATOR_STYLE, Any],
+) -> None:
     if isinstance(card, cards.Effect):
         # This layer isn't used by effect cards
         layer.Visible = False
@@ -83,19 +147,21 @@ def _generate_creature_layer(card: cards.Card, layer: illustrator_com.Layer) ->
     _generate_creature_layer_stat_group(card, page_items["Health"])
     _generate_creature_layer_stat_group(card, page_items["Attack"])
     _generate_creature_layer_stat_group(card, page_items["Speed"])
-    _generate_creature_layer_description(card, page_items["Description"])
+    _generate_creature_layer_description(card, page_items["Description"], styles)
 
 
 def _generate_creature_layer_stat_group(card: cards.Creature, stat_group: illustrator_com.GroupItem) -> None:
     stat_group_name = stat_group.Name
 
-    if not stat_group.TextFrames.Count == 1:
+    text_frames = stat_group.TextFrames
+    number_text_frames = text_frames.Count
+    if not number_text_frames == 1:
         raise errors.IllustratorTemplateError(
             f"Layer '{ILLUSTRATOR_LAYER.CREATURE}', page item '{stat_group_name}': expected 1 text frame, found "
-            f"{stat_group.TextFrames.Count} instead"
+            f"{number_text_frames} instead"
         )
 
-    stat_text_frame = stat_group.TextFrames.Item(1)
+    stat_text_frame = text_frames.Item(1)
     if stat_group_name == "Health":
         stat_text_frame.Contents = str(card.data.hp)
     elif stat_group_name == "Attack":
@@ -104,54 +170,60 @@ def _generate_creature_layer_stat_group(card: cards.Creature, stat_group: illust
         stat_text_frame.Contents = str(card.data.spe)
 
 
-def _generate_creature_layer_description(card: cards.Creature, description: illustrator_com.TextFrame) -> None:
-    description_style = helpers.get_style(description, ILLUSTRATOR_STYLE.DESCRIPTION)
-    trait_name_style = helpers.get_style(description, ILLUSTRATOR_STYLE.TRAIT)
-    icons_style = helpers.get_style(description, ILLUSTRATOR_STYLE.ICONS)
-    reference_name_style = helpers.get_style(description, ILLUSTRATOR_STYLE.REFERENCE_NAME)
+def _generate_creature_layer_description(
+        card: cards.Creature,
+        description: illustrator_com.TextFrame,
+        styles: Dict[ILLUSTRATOR_STYLE, Any],
+) -> None:
+    description_style = styles[ILLUSTRATOR_STYLE.DESCRIPTION]
+    trait_name_style = styles[ILLUSTRATOR_STYLE.TRAIT]
+    icons_style = styles[ILLUSTRATOR_STYLE.ICONS]
+    reference_name_style = styles[ILLUSTRATOR_STYLE.REFERENCE_NAME]
 
-    helpers.prepare_text_frame(description)
-    description.Contents = ""
+    helpers.prepare_text_frame(description, styles)
 
-    traits_name = [t.get_name() for t in card.data.traits]
-    traits_description = [t.data.description for t in card.data.traits]
+    description_paragraphs = _get_creature_description_paragraphs(card)
 
-    # If the creature is a token, we add a "fake trait"
-    if card.data.is_token:
-        traits_name.insert(0, TOKEN_TRAIT_NAME)
-        traits_description.insert(0, TOKEN_TRAIT_DESCRIPTION)
-
-    # Fill in contents
-    for trait_index, (trait_name, trait_description) in enumerate(zip(traits_name, traits_description)):
-        if trait_index > 0:
-            # This isn't the first trait added
-            # So we must add a new line to separate from the previous trait
-            description.Contents = description.Contents + "\r"
-
-        description.Contents = description.Contents + f"{trait_name} {trait_description}"
+    # Fill in contents, with a new line to separate each trait
+    # The contents are set only once, since each read or write of the contents is a call to Illustrator
+    description.Contents = "\r".join(paragraph for _, paragraph in description_paragraphs)
 
     # Format contents by paragraph
-    for paragraph_index, trait_name in enumerate(traits_name, start=1):
-        paragraph = description.Paragraphs.Item(paragraph_index)
+    paragraphs = description.Paragraphs
+    for paragraph_index, (trait_name, _) in enumerate(description_paragraphs, start=1):
+        paragraph = paragraphs.Item(paragraph_index)
 
         icons_indexes, reference_names_indexes = helpers_replacement.replace_placeholders(paragraph)
+        icons_indexes = set(icons_indexes)
+        reference_names_indexes = set(reference_names_indexes)
 
+        character_styles = []
         for i in range(1, len(paragraph.Contents) + 1):
             if i < len(trait_name) + 2:
-                trait_name_style.ApplyTo(paragraph.Characters.Item(i), True)
+                character_styles.append(trait_name_style)
             elif i in icons_indexes:
-                # Sometimes needs to be applied twice to take effect
-                icons_style.ApplyTo(paragraph.Characters.Item(i), True)
-                icons_style.ApplyTo(paragraph.Characters.Item(i), True)
+                character_styles.append(icons_style)
             elif i in reference_names_indexes:
-                reference_name_style.ApplyTo(paragraph.Characters.Item(i), True)
+                character_styles.append(reference_name_style)
             else:
-                description_style.ApplyTo(paragraph.Characters.Item(i), True)
+                character_styles.append(description_style)
+
+        # Styles are applied once for each run of characters with the same style, instead of once for each character
+        for start, length, style in helpers.get_character_style_runs(character_styles):
+            text_range = helpers.get_text_range(paragraph, start, length)
+            style.ApplyTo(text_range, True)
+            if style is icons_style:
+                # Sometimes needs to be applied twice to take effect
+                style.ApplyTo(text_range, True)
 
 
-def _generate_base_layer(card: cards.Card, layer: illustrator_com.Layer) -> None:
+def _generate_base_layer(card: cards.Card, color: cards.Color, layer: illustrator_com.Layer) -> None:
     layer.Visible = True
 
+    card_id = card.get_id()
+    cost_total = card.get_cost_total()
+    cost_color = card.get_cost_color()
+
     page_items = helpers.get_all_page_items_by_name(
         layer,
         [
@@ -178,21 +250,21 @@ def _generate_base_layer(card: cards.Card, layer: illustrator_com.Layer) -> None
         page_items["CostNonColorBackground"].Hidden = True
     else:
         page_items["CostTotalText"].Hidden = False
-        page_items["CostTotalText"].Contents = str(card.get_cost_total())
+        page_items["CostTotalText"].Contents = str(cost_total)
 
-        if card.get_color() == cards.Color.NONE:
+        if color == cards.Color.NONE:
             page_items["CostColorText"].Hidden = True
         else:
             page_items["CostColorText"].Hidden = False
-            page_items["CostColorText"].Contents = str(card.get_cost_color())
+            page_items["CostColorText"].Contents = str(cost_color)
 
         page_items["CostNonColorText"].Hidden = False
-        page_items["CostNonColorText"].Contents = str(card.get_cost_total() - card.get_cost_color())
+        page_items["CostNonColorText"].Contents = str(cost_total - cost_color)
 
         page_items["CostNonColorBackground"].Hidden = False
 
     page_items["Number"].Hidden = False
-    number_cards = len(helpers.get_all_printable_cards())
+    number_cards = helpers.get_number_printable_cards()
     card_number = helpers.get_card_printing_number(card)
     page_items["Number"].Contents = f"{card_number:03d}/{number_cards:03d}"
 
@@ -200,7 +272,7 @@ def _generate_base_layer(card: cards.Card, layer: illustrator_com.Layer) -> None
     git_tag = GIT_TAG_NAME
     if git_tag is None:
         git_tag = "TEST"
-    page_items["Identifier"].Contents = f"{git_tag} | {card.get_id()}"
+    page_items["Identifier"].Contents = f"{git_tag} | {card_id}"
 
     _generate_base_layer_add_art(card, page_items["ArtClipGroup"])
 
@@ -223,14 +295,15 @@ def _generate_base_layer_add_art(card: cards.Card, art_clip_group: illustrator_c
 
     art_border.Hidden = False
 
-    art_files = list(CARD_ARTS_DIR.glob(f"{card.get_id()}.*"))
+    card_id = card.get_id()
+    art_files = helpers.get_card_art_files(card)
     if len(art_files) == 0:
         # No art file found, just hide the default art
         art_linked_file.Hidden = True
         return
     if len(art_files) > 1:
         raise errors.CardPrintError(
-            f"Found multiple arts for card {card.get_id()}: {[file.name for file in art_files]}"
+            f"Found multiple arts for card {card_id}: {[file.name for file in art_files]}"
         )
     art_file = art_files[0]
     art_linked_file.File = str(art_file)
@@ -241,52 +314,20 @@ def _generate_base_layer_add_art(card: cards.Card, art_clip_group: illustrator_c
     art_linked_file.Width = art_border.Width
 
 
-def _generate_background_color_layer(card: cards.Card, layer: illustrator_com.Layer) -> None:
+def _generate_background_color_layer(card: cards.Card, color: cards.Color, layer: illustrator_com.Layer) -> None:
     layer.Visible = True
 
-    color = card.get_color()
-
-    page_items = helpers.get_all_page_items_by_name(
-        layer,
-        [
-            "BackgroundNone",
-            "BackgroundBlack",
-            "BackgroundBlue",
-            "BackgroundCyan",
-            "BackgroundGreen",
-            "BackgroundOrange",
-            "BackgroundPink",
-            "BackgroundPurple",
-            "BackgroundWhite",
-            "BackgroundYellow",
-        ]
-    )
-    page_items_to_color = {
-        "BackgroundNone": cards.Color.NONE,
-        "BackgroundBlack": cards.Color.BLACK,
-        "BackgroundBlue": cards.Color.BLUE,
-        "BackgroundCyan": cards.Color.CYAN,
-        "BackgroundGreen": cards.Color.GREEN,
-        "BackgroundOrange": cards.Color.ORANGE,
-        "BackgroundPink": cards.Color.PINK,
-        "BackgroundPurple": cards.Color.PURPLE,
-        "BackgroundWhite": cards.Color.WHITE,
-        "BackgroundYellow": cards.Color.YELLOW,
-    }
+    page_items = helpers.get_all_page_items_by_name(layer, list(BACKGROUND_COLOR_PAGE_ITEMS))
 
     for page_item_name, page_item in page_items.items():
-        if not page_items_to_color[page_item_name] == color:
-            page_item.Hidden = True
+        if not BACKGROUND_COLOR_PAGE_ITEMS[page_item_name] == color:
             continue
 
         # If we're here, the page item color matches the card's color
         page_item.Hidden = False
-        for i in range(1, page_item.PageItems.Count + 1):
-            if (
-                    isinstance(card, cards.Creature)
-                    and card.data.is_token
-                    and page_item.PageItems.Item(i).Name == "CostColorBackground"
-            ):
-                page_item.PageItems.Item(i).Hidden = True
+        is_token = isinstance(card, cards.Creature) and card.data.is_token
+        for child_page_item in page_item.PageItems:
+            if is_token and child_page_item.Name == "CostColorBackground":
+                child_page_item.Hidden = True
             else:
-                page_item.PageItems.Item(i).Hidden = False
+                child_page_item.Hidden = False
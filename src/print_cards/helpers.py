@@ -1,5 +1,7 @@
+import atexit
+import functools
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 import pywintypes
 import win32com.client
@@ -8,6 +10,7 @@ import src.cards as cards
 import src.print_cards.configs as configs
 import src.print_cards.errors as errors
 from src.print_cards import illustrator_com as illustrator_com
+from src.utils import CARD_ARTS_DIR
 
 
 def get_all_printable_cards() -> List[cards.Card]:
@@ -21,22 +24,71 @@ def get_all_printable_cards() -> List[cards.Card]:
     )
 
 
+# Cached, since sorting all cards for every printed card is slow
+@functools.cache
+def _get_card_printing_numbers() -> Dict[str, int]:
+    """
+    Returns the printing numbers of all printable cards, indexed by card ID
+    """
+
+    return {c.get_id(): i for i, c in enumerate(get_all_printable_cards(), start=1)}
+
+
 def get_card_printing_number(card: cards.Card) -> int:
     """
     Returns the position (1-indexed) of the card in the ordered list of printable cards
     """
 
-    all_cards = get_all_printable_cards()
-    for i, c in enumerate(all_cards, start=1):
-        if c.get_id() == card.get_id():
-            return i
-    raise errors.CardPrintError(f"Card '{card.get_id()}' doesn't verify the printing criteria")
+    card_printing_numbers = _get_card_printing_numbers()
+
+    card_id = card.get_id()
+    if card_id not in card_printing_numbers:
+        raise errors.CardPrintError(f"Card '{card_id}' doesn't verify the printing criteria")
+    return card_printing_numbers[card_id]
+
+
+def get_number_printable_cards() -> int:
+    """
+    Returns the number of printable cards
+    """
+
+    return len(_get_card_printing_numbers())
+
+
+# Cached, since searching the directory for every printed card is slow
+@functools.cache
+def _get_card_art_files_index() -> Dict[str, List[Path]]:
+    """
+    Returns the files in the card arts directory, indexed by their uppercase name up to the first dot
+    """
+
+    card_art_files: Dict[str, List[Path]] = {}
+    for path in CARD_ARTS_DIR.iterdir():
+        name, dot, _ = path.name.partition(".")
+        if dot:
+            card_art_files.setdefault(name.upper(), []).append(path)
+    return card_art_files
+
+
+def get_card_art_files(card: cards.Card) -> List[Path]:
+    """
+    Returns the art files of the card, which are the files in the card arts directory named "<card ID>.<extension>".
+    The name is matched case-insensitively, like file names on Windows.
+    """
+
+    return _get_card_art_files_index().get(card.get_id().upper(), [])
 
 
+@functools.cache
 def get_illustrator_app() -> illustrator_com.Application:
     """
     If Illustrator is open, returns the opened application.
     Otherwise, opens a new one and returns it.
+    Alerts are disabled in the returned application, so they don't block or slow down printing. They're restored when
+    the program exits.
+
+    The application is only looked up once, and reused for every printed card. Since the type library is imported, the
+    returned object is early bound, so its properties and methods are called directly by their IDs.
     """
 
     try:
@@ -45,31 +97,52 @@ def get_illustrator_app() -> illustrator_com.Application:
     except pywintypes.com_error:
         # The Illustrator app wasn't open, open it
         app: illustrator_com.Application = win32com.client.Dispatch("Illustrator.Application")
+    atexit.register(_restore_user_interaction_level, app, app.UserInteractionLevel)
+    app.UserInteractionLevel = illustrator_com.constants.aiDontDisplayAlerts
     return app
 
 
-def export_to_tiff(document: illustrator_com.Document, file_path: Path) -> None:
+def _restore_user_interaction_level(app: illustrator_com.Application, user_interaction_level: int) -> None:
+    try:
+        app.UserInteractionLevel = user_interaction_level
+    except pywintypes.com_error:
+        # Illustrator was closed in the meantime, nothing to restore
+        pass
+
+
+def export_to_tiff(document: illustrator_com.Document, file_path: Path, draft: bool = False) -> None:
     """
     Exports the document to a .tiff file
+    If draft is True, it's exported with a lower resolution and compressed
     """
 
     # We use .with_suffix("") to remove extension, because it's added automatically
     document.Export(
         file_path.with_suffix(""),
         illustrator_com.constants.aiTIFF,
-        configs.get_export_options()
+        configs.get_export_options(draft)
     )
 
 
-def get_style(text_frame: illustrator_com.TextFrame, style: configs.ILLUSTRATOR_STYLE):
-    try:
-        output = text_frame.Layer.Parent.CharacterStyles.Item(style)
-    except pywintypes.com_error:
-        raise errors.IllustratorTemplateError(f"Failed to find a character style named '{style}'")
+def get_styles(document: illustrator_com.Document) -> Dict[configs.ILLUSTRATOR_STYLE, Any]:
+    """
+    Returns a dict with all the character styles of the document, indexed by style.
+
+    The styles should be fetched once per document and reused, since every lookup is a call to Illustrator.
+    """
+
+    character_styles = document.CharacterStyles
+
+    output: Dict[configs.ILLUSTRATOR_STYLE, Any] = {}
+    for style in configs.ILLUSTRATOR_STYLE:
+        try:
+            output[style] = character_styles.Item(style)
+        except pywintypes.com_error:
+            raise errors.IllustratorTemplateError(f"Failed to find a character style named '{style}'")
     return output
 
 
-def prepare_text_frame(text_frame: illustrator_com.TextFrame) -> None:
+def prepare_text_frame(text_frame: illustrator_com.TextFrame, styles: Dict[configs.ILLUSTRATOR_STYLE, Any]) -> None:
     """
     Sets the character style of the text frame to the auxiliary character style.
 
@@ -86,29 +159,63 @@ def prepare_text_frame(text_frame: illustrator_com.TextFrame) -> None:
       auxiliary character style implements these special characters.
     """
 
-    style = get_style(text_frame, configs.ILLUSTRATOR_STYLE.AUXILIARY)
+    style = styles[configs.ILLUSTRATOR_STYLE.AUXILIARY]
     style.ApplyTo(text_frame.TextRange, True)
 
 
-def get_layer(document: illustrator_com.Document, layer: configs.ILLUSTRATOR_LAYER) -> illustrator_com.Layer:
-    number_layers = len(configs.ILLUSTRATOR_LAYER_LIST)
-    if not document.Layers.Count == number_layers:
-        raise errors.IllustratorTemplateError(
-            f"Expected {number_layers} layers, found {document.Layers.Count} instead"
-        )
+def get_character_style_runs(character_styles: List[Any]) -> List[Tuple[int, int, Any]]:
+    """
+    Groups consecutive characters with the same character style.
+    The i-th style of the list is the style of the i-th character.
 
-    if layer not in configs.ILLUSTRATOR_LAYER_LIST:
-        raise errors.CardPrintError(
-            f"Layer '{layer}' is not in the implementation's list of layers"
-        )
+    Returns a list of tuples (start, length, style), where start is the index of the first character (1-indexed).
+    """
 
-    index = configs.ILLUSTRATOR_LAYER_LIST.index(layer) + 1
-    output = document.Layers.Item(index)
-    if not output.Name == layer:
+    runs: List[Tuple[int, int, Any]] = []
+    for i, style in enumerate(character_styles, start=1):
+        if len(runs) > 0 and runs[-1][2] is style:
+            start, length, _ = runs[-1]
+            runs[-1] = (start, length + 1, style)
+        else:
+            runs.append((i, 1, style))
+    return runs
+
+
+def get_text_range(text_frame: illustrator_com.TextFrame, start: int, length: int) -> illustrator_com.TextRange:
+    """
+    Returns the text range of the text frame with the given length, starting at the given character (1-indexed)
+    """
+
+    text_range = text_frame.Characters.Item(start)
+    text_range.Length = length
+    return text_range
+
+
+def get_layers(document: illustrator_com.Document) -> Dict[configs.ILLUSTRATOR_LAYER, illustrator_com.Layer]:
+    """
+    Returns a dict with all the layers of the document, indexed by layer.
+
+    The layers are fetched and validated in a single pass, so this should be called once per document.
+    """
+
+    document_layers = document.Layers
+
+    number_layers = len(configs.ILLUSTRATOR_LAYER_LIST)
+    number_document_layers = document_layers.Count
+    if not number_document_layers == number_layers:
         raise errors.IllustratorTemplateError(
-            f"Expected layer in position {index} to have name '{layer}', found '{output.name}' instead"
+            f"Expected {number_layers} layers, found {number_document_layers} instead"
         )
 
+    output: Dict[configs.ILLUSTRATOR_LAYER, illustrator_com.Layer] = {}
+    for index, (layer, document_layer) in enumerate(zip(configs.ILLUSTRATOR_LAYER_LIST, document_layers), start=1):
+        document_layer_name = document_layer.Name
+        if not document_layer_name == layer:
+            raise errors.IllustratorTemplateError(
+                f"Expected layer in position {index} to have name '{layer}', found '{document_layer_name}' instead"
+            )
+        output[layer] = document_layer
+
     return output
 
 
@@ -121,18 +228,21 @@ def get_all_page_items_by_name(parent: Any, page_item_names: List[str]) -> Dict[
     """
 
     parent_name = parent.Name
+    parent_page_items = parent.PageItems
 
-    if not parent.PageItems.Count == len(page_item_names):
+    number_page_items = parent_page_items.Count
+    if not number_page_items == len(page_item_names):
         raise errors.IllustratorTemplateError(
-            f"Object '{parent_name}': expected {len(page_item_names)} page items, found {parent.PageItems.Count} "
+            f"Object '{parent_name}': expected {len(page_item_names)} page items, found {number_page_items} "
             f"instead"
         )
 
+    page_item_names_set = set(page_item_names)
     page_items_dict: Dict[str, Any] = {}
-    for i in range(1, len(page_item_names) + 1):
-        page_item = parent.PageItems.Item(i)
+    # Enumerating the collection avoids a call to Illustrator for each Item()
+    for i, page_item in enumerate(parent_page_items, start=1):
         page_item_name = page_item.Name
-        if page_item_name not in page_item_names:
+        if page_item_name not in page_item_names_set:
             raise errors.IllustratorTemplateError(
                 f"Object '{parent_name}', page item with index {i}: expected to have a name in the list "
                 f"{page_item_names}, found name '{page_item_name}' instead"
@@ -1,3 +1,4 @@
+import functools
 import re
 from typing import List, Tuple
 
@@ -6,6 +7,15 @@ import src.print_cards.errors as errors
 import src.print_cards.illustrator_com as illustrator_com
 from src.print_cards.configs import KEYWORD_TO_CHARACTER_DICT
 
+# Patterns are compiled once, since they're used for every text frame of every card
+_PATTERN_DESCRIPTIONS = re.compile(r"\(REF\:(?P<id>[^\)]+?)\.DESCRIPTION\)")
+_PATTERN_KEYWORDS = "|".join(
+    # Escape the values because they have special characters
+    re.escape(keyword) for keyword in KEYWORD_TO_CHARACTER_DICT
+)
+_PATTERN_NAMES = r"\(REF\:(?P<id>[^\)]+?)\.NAME\)"
+_PATTERN_KEYWORDS_AND_NAMES = re.compile(rf"({_PATTERN_KEYWORDS})|({_PATTERN_NAMES})")
+
 
 def replace_placeholders(text_frame: illustrator_com.TextFrame) -> Tuple[List[int], List[int]]:
     """
@@ -16,36 +26,58 @@ def replace_placeholders(text_frame: illustrator_com.TextFrame) -> Tuple[List[in
       - Indices of the characters belonging to references' names (1-indexed)
     """
 
-    # Replace descriptions first, because the replacement text may have keywords or names
-    _replace_descriptions(text_frame)
-    list_indices_keyword_characters, list_indices_name_characters = _replace_keywords_and_names(text_frame)
+    # The contents are read and written only once, since each read or write is a call to Illustrator
+    text_before = text_frame.Contents
+
+    text_after, list_indices_keyword_characters, list_indices_name_characters = replace_placeholders_in_text(text_before)
+
+    if not text_after == text_before:
+        text_frame.Contents = text_after
     return list_indices_keyword_characters, list_indices_name_characters
 
 
-def _replace_descriptions(text_frame: illustrator_com.TextFrame):
-    text_before = text_frame.Contents
+def replace_placeholders_in_text(text_before: str) -> Tuple[str, List[int], List[int]]:
+    """
+    Replaces all keywords in the text with the respective icons, and references with content
+
+    Returns the text after replacing, and 2 lists:
+      - Indices of the character icons (1-indexed)
+      - Indices of the characters belonging to references' names (1-indexed)
+    """
 
-    pattern = r"\(REF\:(?P<id>[^\)]+?)\.DESCRIPTION\)"
-    matches = re.finditer(pattern, text_before)
+    # Replace descriptions first, because the replacement text may have keywords or names
+    text_after = _replace_descriptions(text_before)
+    return _replace_keywords_and_names(text_after)
 
-    text_after = ""
+
+def _replace_descriptions(text_before: str) -> str:
+    matches = _PATTERN_DESCRIPTIONS.finditer(text_before)
+
+    # The text is joined once at the end, instead of concatenating it for every match
+    parts_after: List[str] = []
     index_last_match_end = 0
     for match in matches:
         match_replacement = _get_replacement_text_for_description_match(match)
 
-        text_after += text_before[index_last_match_end:match.start()] + match_replacement
+        parts_after.append(text_before[index_last_match_end:match.start()])
+        parts_after.append(match_replacement)
         index_last_match_end = match.end()
 
-    text_after += text_before[index_last_match_end:]
+    parts_after.append(text_before[index_last_match_end:])
 
-    text_frame.Contents = text_after
+    return "".join(parts_after)
 
 
 def _get_replacement_text_for_description_match(match: re.Match) -> str:
-    trait_id = str(match["id"])
+    return _get_replacement_text_for_description(str(match["id"]), match.group(0))
+
+
+# The replacement texts are cached, since the same references appear in many cards
+@functools.cache
+def _get_replacement_text_for_description(trait_id: str, reference: str) -> str:
     trait = cards.get_mechanic(trait_id)
     if not isinstance(trait, cards.Trait):
-        raise errors.CardPrintError(f"Found reference '{match.group(0)}', but '{trait_id}' isn't a trait ID")
+        raise errors.CardPrintError(f"Found reference '{reference}', but '{trait_id}' isn't a trait ID")
 
     replacement = trait.data.description
     if replacement[-1] == ".":  # Remove ending full stop
@@ -54,48 +86,51 @@ def _get_replacement_text_for_description_match(match: re.Match) -> str:
     return replacement
 
 
-def _replace_keywords_and_names(text_frame: illustrator_com.TextFrame) -> Tuple[List[int], List[int]]:
+def _replace_keywords_and_names(text_before: str) -> Tuple[str, List[int], List[int]]:
     """
-    Returns 2 lists:
+    Returns the text after replacing, and 2 lists:
       - Indices of the character icons (1-indexed)
       - Indices of the characters belonging to references' names (1-indexed)
     """
 
-    text_before = text_frame.Contents
+    matches = _PATTERN_KEYWORDS_AND_NAMES.finditer(text_before)
 
-    pattern_keywords = "|".join(
-        # Escape the values because they have special characters
-        re.escape(keyword) for keyword in KEYWORD_TO_CHARACTER_DICT
-    )
-    pattern_names = r"\(REF\:(?P<id>[^\)]+?)\.NAME\)"
-    pattern = rf"({pattern_keywords})|({pattern_names})"
-    matches = re.finditer(pattern, text_before)
-
-    text_after = ""
+    # The text is joined once at the end, instead of concatenating it for every match
+    # Its length is tracked alongside, to compute the indices of the replacements
+    parts_after: List[str] = []
+    length_after = 0
     index_last_match_end = 0
     list_indices_keyword_characters: List[int] = []
     list_indices_name_characters: List[int] = []
     for match in matches:
+        text_between_matches = text_before[index_last_match_end:match.start()]
+        parts_after.append(text_between_matches)
+        length_after += len(text_between_matches)
+
         if match.group(0) in KEYWORD_TO_CHARACTER_DICT:
             match_replacement = KEYWORD_TO_CHARACTER_DICT[match.group(0)]
 
-            list_indices_keyword_characters += range(len(text_after) + 1, len(text_after) + 1 + len(match_replacement))
+            list_indices_keyword_characters += range(length_after + 1, length_after + 1 + len(match_replacement))
         else:
             match_replacement = _get_replacement_text_for_name_match(match)
 
-            list_indices_name_characters += range(len(text_after) + 1, len(text_after) + 1 + len(match_replacement))
+            list_indices_name_characters += range(length_after + 1, length_after + 1 + len(match_replacement))
 
-        text_after += text_before[index_last_match_end:match.start()] + match_replacement
+        parts_after.append(match_replacement)
+        length_after += len(match_replacement)
         index_last_match_end = match.end()
 
-    text_after += text_before[index_last_match_end:]
+    parts_after.append(text_before[index_last_match_end:])
 
-    text_frame.Contents = text_after
-    return list_indices_keyword_characters, list_indices_name_characters
+    return "".join(parts_after), list_indices_keyword_characters, list_indices_name_characters
 
 
 def _get_replacement_text_for_name_match(match: re.match) -> str:
-    mechanic_id = str(match["id"])
+    return _get_replacement_text_for_name(str(match["id"]))
+
+
+@functools.cache
+def _get_replacement_text_for_name(mechanic_id: str) -> str:
     mechanic = cards.get_mechanic(mechanic_id)
 
     replacement = mechanic.get_name()
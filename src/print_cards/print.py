@@ -1,5 +1,7 @@
-import os
+import atexit
+import functools
 import shutil
+import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -9,6 +11,7 @@ import src.print_cards.generate_blank_front as generate_blank_front
 import src.print_cards.generate_front as generate_front
 import src.print_cards.helpers as helpers
 import src.print_cards.illustrator_com as illustrator_com
+from src.print_cards.configs import ILLUSTRATOR_LAYER, BACKGROUND_COLOR_PAGE_ITEMS
 from src.utils import CARD_TEMPLATE_PATH
 
 
@@ -19,6 +22,7 @@ def print_card(
         skip_back: bool = False,
         front_file_name: Optional[str] = None,
         back_file_name: Optional[str] = None,
+        draft: bool = False,
 ) -> None:
     app = helpers.get_illustrator_app()
 
@@ -27,14 +31,14 @@ def print_card(
         if file_name is None:
             file_name = f"{card.get_id()}_front"  # Extension is added on export
 
-        _print_card_front(card, app, output_dir, file_name)
+        _print_card_front(card, app, output_dir, file_name, draft)
 
     if not skip_back:
         file_name = back_file_name
         if file_name is None:
             file_name = f"{card.get_id()}_front"  # Extension is added on export
 
-        _print_card_back(card.get_color(), app, output_dir, file_name)
+        _print_card_back(card.get_color(), app, output_dir, file_name, draft)
 
 
 def _print_card_front(
@@ -42,16 +46,12 @@ def _print_card_front(
         app: illustrator_com.Application,
         output_dir: Path,
         file_name: str,
+        draft: bool,
 ) -> None:
-    output_path = output_dir / file_name
-    temp_file_path = output_dir / f"{file_name}.temp"
-
-    shutil.copy2(CARD_TEMPLATE_PATH, temp_file_path)
-    temp_document = app.Open(temp_file_path)
+    temp_document = app.Open(_get_template_copy_path())
     generate_front.generate_front(card, temp_document)
-    helpers.export_to_tiff(temp_document, output_path)
+    _export_to_tiff(temp_document, output_dir, file_name, draft)
     temp_document.Close(illustrator_com.constants.aiDoNotSaveChanges)
-    os.remove(temp_file_path)
 
 
 def _print_card_back(
@@ -59,16 +59,12 @@ def _print_card_back(
         app: illustrator_com.Application,
         output_dir: Path,
         file_name: str,
+        draft: bool,
 ) -> None:
-    output_path = output_dir / file_name
-    temp_file_path = output_dir / f"{file_name}.temp"
-
-    shutil.copy2(CARD_TEMPLATE_PATH, temp_file_path)
-    temp_document = app.Open(temp_file_path)
+    temp_document = app.Open(_get_template_copy_path())
     generate_back.generate_back(color, temp_document)
-    helpers.export_to_tiff(temp_document, output_path)
+    _export_to_tiff(temp_document, output_dir, file_name, draft)
     temp_document.Close(illustrator_com.constants.aiDoNotSaveChanges)
-    os.remove(temp_file_path)
 
 
 def print_blank_card(
@@ -78,6 +74,7 @@ def print_blank_card(
         skip_back: bool = False,
         front_file_name: Optional[str] = None,
         back_file_name: Optional[str] = None,
+        draft: bool = False,
 ) -> None:
     app = helpers.get_illustrator_app()
 
@@ -86,14 +83,14 @@ def print_blank_card(
         if file_name is None:
             file_name = f"{str(color)}_front"  # Extension is added on export
 
-        _print_blank_card_front(color, app, output_dir, file_name)
+        _print_blank_card_front(color, app, output_dir, file_name, draft)
 
     if not skip_back:
         file_name = back_file_name
         if file_name is None:
             file_name = f"{str(color)}_front"  # Extension is added on export
 
-        _print_card_back(color, app, output_dir, file_name)
+        _print_card_back(color, app, output_dir, file_name, draft)
 
 
 def _print_blank_card_front(
@@ -101,13 +98,71 @@ def _print_blank_card_front(
         app: illustrator_com.Application,
         output_dir: Path,
         file_name: str,
+        draft: bool,
 ) -> None:
-    output_path = output_dir / file_name
-    temp_file_path = output_dir / f"{file_name}.temp"
-
-    shutil.copy2(CARD_TEMPLATE_PATH, temp_file_path)
-    temp_document = app.Open(temp_file_path)
+    temp_document = app.Open(_get_template_copy_path())
     generate_blank_front.generate_blank_front(color, temp_document)
-    helpers.export_to_tiff(temp_document, output_path)
+    _export_to_tiff(temp_document, output_dir, file_name, draft)
     temp_document.Close(illustrator_com.constants.aiDoNotSaveChanges)
-    os.remove(temp_file_path)
+
+
+def _export_to_tiff(document: illustrator_com.Document, output_dir: Path, file_name: str, draft: bool) -> None:
+    """
+    Exports the document to a .tiff file in the output directory.
+
+    The document is exported to the local temporary directory first, and then moved to the output directory in one go.
+    Illustrator writes the file in many small chunks, which is slow if the output directory is in a network drive.
+    """
+
+    local_path = _get_temp_dir() / file_name
+    helpers.export_to_tiff(document, local_path, draft)
+
+    # The extension is added by Illustrator on export
+    exported_path = local_path.with_suffix(".tif")
+    shutil.move(exported_path, output_dir / exported_path.name)
+
+
+@functools.cache
+def _get_temp_dir() -> Path:
+    """
+    Returns the path to a local temporary directory, which is deleted when the program exits.
+    """
+
+    temp_dir = Path(tempfile.mkdtemp())
+    atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+    return temp_dir
+
+
+@functools.cache
+def _get_template_copy_path() -> Path:
+    """
+    Returns the path to a copy of the card template, which is opened to print every card.
+
+    The template is only copied once per run, instead of once per printed card. The copy is prepared once (see
+    _prepare_template_copy), and the documents are always closed without saving, so it stays the same afterward. The copy
+    is deleted when the program exits.
+    """
+
+    template_copy_path = _get_temp_dir() / CARD_TEMPLATE_PATH.name
+    shutil.copy2(CARD_TEMPLATE_PATH, template_copy_path)
+    _prepare_template_copy(template_copy_path)
+    return template_copy_path
+
+
+def _prepare_template_copy(template_copy_path: Path) -> None:
+    """
+    Hides all the page items of the background color layer in the template copy.
+
+    This way, each printed card only needs to show the page item of its color.
+    """
+
+    app = helpers.get_illustrator_app()
+
+    document = app.Open(template_copy_path)
+    layer = helpers.get_layers(document)[ILLUSTRATOR_LAYER.BACKGROUND_COLOR]
+    page_items = helpers.get_all_page_items_by_name(layer, list(BACKGROUND_COLOR_PAGE_ITEMS))
+    for page_item in page_items.values():
+        page_item.Hidden = True
+
+    document.Save()
+    document.Close(illustrator_com.constants.aiDoNotSaveChanges)
@@ -1 +1,2 @@
 from src.utils.common_vars import *
+from src.utils.yaml_utils import load_yaml_file, load_yaml_files, write_yaml_files
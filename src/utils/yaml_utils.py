@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, TypeVar
+
+import yaml
+
+# The C loader (from libyaml) is much faster, but it's only available if PyYAML was built with libyaml
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+_T = TypeVar("_T")
+
+
+def load_yaml_file(yaml_path: Path) -> Any:
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def load_yaml_files(yaml_paths: Iterable[Path]) -> List[Any]:
+    """
+    Reads and parses all given YAML files, in a thread pool so the file reads overlap.
+    Returns the parsed data in the same order as the paths, so the caller can create the cards one by one,
+    since the card dicts aren't thread-safe.
+    """
+
+    # Threads are used instead of processes, since the scripts that import card data do it at module level,
+    # which would be run again by every spawned process on Windows
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(load_yaml_file, yaml_paths))
+
+
+def write_yaml_files(write_yaml_file: Callable[[_T], None], items: Iterable[_T]) -> None:
+    """
+    Calls write_yaml_file on each item, in a thread pool so the file writes overlap.
+    """
+
+    # The files are small, so most of the time is spent opening and closing them, which threads can overlap
+    with ThreadPoolExecutor() as executor:
+        # list() is needed to raise any exception from the threads
+        _ = list(executor.map(write_yaml_file, items))